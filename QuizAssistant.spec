@@ -19,6 +19,7 @@ a = Analysis(
         'src.settings_manager',
         'pynput.keyboard._win32',
         'pynput.mouse._win32',
+        'mss.windows',
     ],
     hookspath=[],
     hooksconfig={},
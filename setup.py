@@ -6,7 +6,7 @@ Configure Gemini API credentials
 
 import os
 import json
-import hashlib
+import base64
 import getpass
 import sys
 from pathlib import Path
@@ -42,9 +42,9 @@ class AISetup:
         except Exception as e:
             print(f"❌ Error saving config: {e}")
 
-    def hash_api_key(self, api_key: str) -> str:
-        """Hash API key for secure storage"""
-        return hashlib.sha256(api_key.encode()).hexdigest()
+    def encode_api_key(self, api_key: str) -> str:
+        """Encode API key for storage (simple obfuscation, same as the app)"""
+        return base64.b64encode(api_key.encode()).decode()
 
     def setup_gemini(self):
         """Setup Gemini API"""
@@ -53,7 +53,7 @@ class AISetup:
 
         # Enter API key
         while True:
-            api_key = getpass.getpass("Enter Gemini API Key (will be hashed): ").strip()
+            api_key = getpass.getpass("Enter Gemini API Key (will be encoded): ").strip()
             if not api_key:
                 print("❌ API key cannot be empty")
                 continue
@@ -71,10 +71,10 @@ class AISetup:
 
             break
 
-        # Hash and save (only hash, not real key for security)
-        hashed_key = self.hash_api_key(api_key)
+        # Encode and save (a one-way hash could never be read back by the app)
+        encoded_key = self.encode_api_key(api_key)
         self.config.update({
-            'gemini_api_key_hash': hashed_key
+            'gemini_api_key': encoded_key
         })
 
         print("✅ Gemini API key configured")
@@ -116,9 +116,14 @@ class AISetup:
         print("=" * 40)
 
         # Display Gemini status
-        has_gemini = bool(self.config.get('gemini_api_key_hash')) or bool(os.getenv('GEMINI_API_KEY'))
+        has_gemini = (bool(self.config.get('gemini_api_key'))
+                      or bool(os.getenv('GEMINI_API_KEY')))
         print(f"Google Gemini: {'✅ Configured' if has_gemini else '❌ Not configured'}")
 
+        # Older setups stored only a hash, which the app cannot use
+        if not has_gemini and self.config.get('gemini_api_key_hash'):
+            print("⚠️ Legacy hashed key found, please re-run option 1")
+
     def main_menu(self):
         """Main menu"""
         while True:
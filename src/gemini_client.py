@@ -13,6 +13,14 @@ from google.genai import types
 from models import QuizResult, QuizQuestion
 from logger import Logger
 
+# Use orjson for faster parsing when available (optional dependency).
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so error handling is unchanged.
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 
 # Question modes
 MODE_MULTIPLE_CHOICE = "multiple_choice"
@@ -24,6 +32,21 @@ class NoQuestionsFoundError(Exception):
     pass
 
 
+def detect_image_mime_type(image_bytes: bytes) -> str:
+    """
+    Detect image MIME type from magic bytes
+    
+    Args:
+        image_bytes: Encoded image
+    
+    Returns:
+        "image/jpeg" for JPEG data, otherwise "image/png"
+    """
+    if image_bytes[:3] == b'\xff\xd8\xff':
+        return "image/jpeg"
+    return "image/png"
+
+
 class GeminiAPIClient:
     """Client to communicate with Gemini API"""
     
@@ -159,7 +182,7 @@ Return only JSON, no other text."""
         Send image to Gemini API and get question analysis
         
         Args:
-            image_bytes: Image in bytes (PNG format)
+            image_bytes: Image in bytes (JPEG or PNG format)
             timeout: Timeout for API call (default: 30 seconds)
         
         Returns:
@@ -187,7 +210,7 @@ Return only JSON, no other text."""
             
             # Create content with image and text
             contents = [
-                types.Part.from_bytes(data=image_bytes, mime_type="image/png"),
+                types.Part.from_bytes(data=image_bytes, mime_type=detect_image_mime_type(image_bytes)),
                 types.Part.from_text(text=prompt)
             ]
             
@@ -265,7 +288,7 @@ Return only JSON, no other text."""
             cleaned_text = cleaned_text.strip()
             
             # Parse JSON
-            data = json.loads(cleaned_text)
+            data = json_loads(cleaned_text)
             
             # Validate structure
             if "questions" not in data:
@@ -6,6 +6,7 @@ Listen and handle global hotkeys and secondary mouse button
 from pynput import keyboard, mouse
 from typing import Callable, Optional
 import logging
+import time
 
 
 class HotkeyListener:
@@ -20,6 +21,9 @@ class HotkeyListener:
         'settings': 's',
     }
     
+    # Keys that count as "Alt held"
+    _ALT_KEYS = frozenset((keyboard.Key.alt, keyboard.Key.alt_l, keyboard.Key.alt_r))
+    
     def __init__(self, 
                  on_capture_key: Callable[[], None],
                  on_check_key: Callable[[], None],
@@ -29,7 +33,8 @@ class HotkeyListener:
                  on_show_answers: Callable[[], None] = None,
                  on_reset_answers: Callable[[], None] = None,
                  on_setup: Callable[[], None] = None,
-                 settings_manager = None):
+                 settings_manager = None,
+                 enable_mouse: bool = False):
         """
         Initialize HotkeyListener
         
@@ -43,6 +48,8 @@ class HotkeyListener:
             on_reset_answers: Callback when Alt+R pressed - reset answer history
             on_setup: Callback when Alt+S pressed - show setup dialog
             settings_manager: SettingsManager instance for custom hotkeys
+            enable_mouse: Start the mouse listener (MIDDLE + scroll gestures).
+                Off by default so keyboard-only use runs a single listener thread
         """
         self.on_capture_key = on_capture_key
         self.on_check_key = on_check_key
@@ -53,10 +60,18 @@ class HotkeyListener:
         self.on_reset_answers = on_reset_answers
         self.on_setup = on_setup
         self.settings_manager = settings_manager
+        self.enable_mouse = enable_mouse
         
         # Load custom hotkeys from settings
         self.hotkeys = self._load_hotkeys()
         
+        # Dispatch tables: key -> (description, callback)
+        self._alt_table = self._build_alt_table()
+        self._plain_table = {
+            keyboard.Key.delete: ("Clear logs hotkey (Delete)", self.on_clear_logs),
+            '`': ("Exit hotkey (`)", self.on_exit_key),
+        }
+        
         self.keyboard_listener: Optional[keyboard.Listener] = None
         self.mouse_listener: Optional[mouse.Listener] = None
         self.logger = logging.getLogger(__name__)
@@ -85,9 +100,25 @@ class HotkeyListener:
             hotkeys['settings'] = self.settings_manager.get('hotkey_settings', 's')
         return hotkeys
     
+    def _build_alt_table(self) -> dict:
+        """Build Alt+key dispatch table from current hotkeys"""
+        actions = [
+            ('capture', "Capture", self.on_capture_key),
+            ('results', "Toggle result popup", self.on_check_key),
+            ('answers', "Toggle answers popup", self.on_show_answers),
+            ('reset', "Reset answers", self.on_reset_answers),
+            ('settings', "Setup", self.on_setup),
+        ]
+        table = {}
+        for name, description, callback in actions:
+            # setdefault keeps the first action if two hotkeys share a key
+            table.setdefault(self.hotkeys[name], (description, callback))
+        return table
+    
     def reload_hotkeys(self):
         """Reload hotkeys from settings (call after settings change)"""
         self.hotkeys = self._load_hotkeys()
+        self._alt_table = self._build_alt_table()
         self.logger.info(f"Hotkeys reloaded: {self.hotkeys}")
     
     def start(self):
@@ -106,16 +137,17 @@ class HotkeyListener:
             self.keyboard_listener.start()
             self.logger.info("Keyboard listener started")
         
-        # Start mouse listener
-        if self.mouse_listener and self.mouse_listener.is_alive():
-            self.logger.warning("Mouse listener is already running")
-        else:
-            self.mouse_listener = mouse.Listener(
-                on_click=self.on_mouse_click,
-                on_scroll=self.on_mouse_scroll
-            )
-            self.mouse_listener.start()
-            self.logger.info("Mouse listener started")
+        # Start mouse listener only when mouse gestures are enabled
+        if self.enable_mouse:
+            if self.mouse_listener and self.mouse_listener.is_alive():
+                self.logger.warning("Mouse listener is already running")
+            else:
+                self.mouse_listener = mouse.Listener(
+                    on_click=self.on_mouse_click,
+                    on_scroll=self.on_mouse_scroll
+                )
+                self.mouse_listener.start()
+                self.logger.info("Mouse listener started")
     
     def stop(self):
         """
@@ -184,63 +216,52 @@ class HotkeyListener:
         """
         Handle key press event
         Delete: Clear logs
-        F12: Exit program
+        ` (backtick): Exit program
+        Alt + custom key: dispatched through the Alt hotkey table
         
         Args:
             key: Key object from pynput
         """
         try:
             # Track Alt key
-            if isinstance(key, keyboard.Key):
-                if key == keyboard.Key.alt or key == keyboard.Key.alt_l or key == keyboard.Key.alt_r:
-                    self.alt_pressed = True
-                elif key == keyboard.Key.delete:
-                    self.logger.info("Clear logs hotkey (Delete) pressed")
-                    if self.on_clear_logs:
-                        self.on_clear_logs()
-
+            if key in self._ALT_KEYS:
+                self.alt_pressed = True
+                return
+            
+            key_char = getattr(key, 'char', None)
+            
+            # Fixed hotkeys (Delete, backtick) work with or without Alt
+            entry = self._plain_table.get(key_char or key)
+            if entry:
+                description, callback = entry
+                self.logger.info(f"{description} pressed")
+                if callback:
+                    callback()
+                return
             
             # Handle Alt + custom hotkeys with debounce
-            elif hasattr(key, 'char') and key.char:
-                # Handle ` (backtick) key for exit
-                if key.char == '`':
-                    self.logger.info("Exit hotkey (`) pressed")
-                    self.on_exit_key()
-                    return
-                
-                if self.alt_pressed:
-                    import time
-                    current_time = time.time()
-                    key_char = key.char.lower()
-                    
-                    # Check debounce
-                    last_time = self._last_hotkey_time.get(key_char, 0)
-                    if current_time - last_time < self._hotkey_cooldown:
-                        self.logger.debug(f"Hotkey {key_char} ignored (debounce)")
-                        return
-                    
-                    # Update last time
-                    self._last_hotkey_time[key_char] = current_time
-                    
-                    # Check against custom hotkeys
-                    if key_char == self.hotkeys['capture']:
-                        self.logger.info(f"Capture hotkey (Alt+{key_char.upper()}) pressed")
-                        self.on_capture_key()
-                    elif key_char == self.hotkeys['results']:
-                        self.logger.info(f"Toggle result popup hotkey (Alt+{key_char.upper()}) pressed")
-                        self.on_check_key()
-                    elif key_char == self.hotkeys['answers']:
-                        self.logger.info(f"Toggle answers popup hotkey (Alt+{key_char.upper()}) pressed")
-                        if self.on_show_answers:
-                            self.on_show_answers()
-                    elif key_char == self.hotkeys['reset']:
-                        self.logger.info(f"Reset answers hotkey (Alt+{key_char.upper()}) pressed")
-                        if self.on_reset_answers:
-                            self.on_reset_answers()
-                    elif key_char == self.hotkeys['settings']:
-                        self.logger.info(f"Setup hotkey (Alt+{key_char.upper()}) pressed")
-                        if self.on_setup:
-                            self.on_setup()
+            if not (self.alt_pressed and key_char):
+                return
+            
+            key_char = key_char.lower()
+            entry = self._alt_table.get(key_char)
+            if entry is None:
+                return
+            
+            # Check debounce
+            current_time = time.time()
+            last_time = self._last_hotkey_time.get(key_char, 0)
+            if current_time - last_time < self._hotkey_cooldown:
+                self.logger.debug(f"Hotkey {key_char} ignored (debounce)")
+                return
+            
+            # Update last time
+            self._last_hotkey_time[key_char] = current_time
+            
+            description, callback = entry
+            self.logger.info(f"{description} hotkey (Alt+{key_char.upper()}) pressed")
+            if callback:
+                callback()
         
         except Exception as e:
             self.logger.error(f"Error handling key press: {e}", exc_info=True)
@@ -248,8 +269,7 @@ class HotkeyListener:
     def on_key_release(self, key):
         """Handle key release event"""
         try:
-            if isinstance(key, keyboard.Key):
-                if key == keyboard.Key.alt or key == keyboard.Key.alt_l or key == keyboard.Key.alt_r:
-                    self.alt_pressed = False
+            if key in self._ALT_KEYS:
+                self.alt_pressed = False
         except Exception as e:
             self.logger.error(f"Error handling key release: {e}", exc_info=True)
@@ -7,9 +7,10 @@ import sys
 import threading
 import time
 import os
-import json
+import glob
+import base64
 import hashlib
-from typing import Optional, Dict
+from typing import Optional, Set
 from concurrent.futures import ThreadPoolExecutor, Future
 
 # Try different import paths for development vs bundled exe
@@ -92,7 +93,8 @@ class QuizAssistantApp:
             on_show_answers=self.on_show_answers_hotkey,
             on_reset_answers=self.on_reset_answers_hotkey,
             on_setup=self.on_setup_hotkey,
-            settings_manager=self.settings_manager
+            settings_manager=self.settings_manager,
+            enable_mouse=True  # MIDDLE + scroll capture / show answers
         )
         
         # Initialize system tray
@@ -104,8 +106,9 @@ class QuizAssistantApp:
             thread_name_prefix="APIWorker"
         )
         
-        # Dictionary to track active future tasks
-        self._active_futures: Dict[str, Future] = {}
+        # Set of active future tasks (lock guards mutation only)
+        self._active_futures: Set[Future] = set()
+        self._futures_lock = threading.Lock()
         
         # Running flag
         self._running = False
@@ -140,36 +143,21 @@ class QuizAssistantApp:
     
     def _save_api_key(self, api_key: str) -> None:
         """Save API key to config and environment"""
-        import base64
-        
         # Encode API key (simple obfuscation, not secure encryption)
         encoded_key = base64.b64encode(api_key.encode()).decode()
         
-        config = {}
-        if os.path.exists("config.json"):
-            with open("config.json", 'r', encoding='utf-8') as f:
-                config = json.load(f)
-        
-        config['gemini_api_key'] = encoded_key
-        
-        with open("config.json", 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        # Save through settings manager so later saves keep the key
+        self.settings_manager.settings['gemini_api_key'] = encoded_key
+        self.settings_manager.save_settings()
         
         os.environ['GEMINI_API_KEY'] = api_key
         self.logger.info("API key saved successfully")
     
     def _load_api_key_from_config(self) -> str:
         """Load API key from config.json if exists"""
-        import base64
-        
-        if not os.path.exists("config.json"):
-            return ''
-        
         try:
-            with open("config.json", 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            encoded_key = config.get('gemini_api_key', '')
+            # Settings manager has already loaded config.json
+            encoded_key = self.settings_manager.get('gemini_api_key', '')
             if encoded_key:
                 api_key = base64.b64decode(encoded_key.encode()).decode()
                 return api_key
@@ -260,18 +248,11 @@ class QuizAssistantApp:
             self.logger.info("Closed previous popup before new capture")
         
         try:
-            # Capture screen (DO NOT show notification)
-            screenshot = self.screenshot_manager.capture_screen()
-            
-            if screenshot is None:
-                self.logger.error("Failed to capture screenshot")
-                return
-            
-            # Convert to bytes
-            image_bytes = self.screenshot_manager.save_to_memory(screenshot)
+            # Capture screen, downscale and convert to bytes (DO NOT show notification)
+            image_bytes = self.screenshot_manager.capture_and_save()
             
             if image_bytes is None:
-                self.logger.error("Failed to save screenshot to memory")
+                self.logger.error("Failed to capture screenshot")
                 return
             
             # Create new request
@@ -286,7 +267,8 @@ class QuizAssistantApp:
             )
             
             # Save future to track
-            self._active_futures[request_id] = future
+            with self._futures_lock:
+                self._active_futures.add(future)
             
             # Add callback to handle exception from thread
             future.add_done_callback(
@@ -435,8 +417,8 @@ class QuizAssistantApp:
                 self.logger.info(f"Thread completed successfully for request {request_id}")
             
             # Cleanup: Remove future from active futures
-            if request_id in self._active_futures:
-                del self._active_futures[request_id]
+            with self._futures_lock:
+                self._active_futures.discard(future)
                 
         except Exception as e:
             self.logger.error(
@@ -514,9 +496,6 @@ class QuizAssistantApp:
         try:
             self.logger.info("Clear logs and answers hotkey triggered")
             
-            import glob
-            import os
-            
             # Close all handlers to free files
             if self.logger.logger:
                 for handler in self.logger.logger.handlers[:]:
@@ -606,8 +585,6 @@ class QuizAssistantApp:
         self.logger.info("Reset answers hotkey triggered (Alt+R)")
         
         try:
-            import os
-            
             # Delete answer file
             if os.path.exists(self._answer_file):
                 os.remove(self._answer_file)
@@ -682,7 +659,6 @@ class QuizAssistantApp:
         Format: A B D AE C... (each answer separated by space)
         """
         try:
-            import os
             if os.path.exists(self._answer_file):
                 with open(self._answer_file, 'r', encoding='utf-8') as f:
                     content = f.read().strip()
@@ -735,15 +711,20 @@ class QuizAssistantApp:
                 # Then force shutdown
                 try:
                     # Cancel pending futures
-                    for request_id, future in list(self._active_futures.items()):
-                        if not future.done():
-                            future.cancel()
-                            self.logger.info(f"Cancelled pending request: {request_id}")
+                    with self._futures_lock:
+                        pending_futures = list(self._active_futures)
+                    for future in pending_futures:
+                        if not future.done() and future.cancel():
+                            self.logger.info("Cancelled pending request")
                     
                     self.logger.info("Thread pool shutdown completed")
                 except Exception as e:
                     self.logger.error(f"Error shutting down thread pool: {str(e)}")
             
+            # Release screen capture handle
+            if self.screenshot_manager:
+                self.screenshot_manager.close()
+            
             # Stop system tray
             if self.system_tray:
                 self.system_tray.stop()
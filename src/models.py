@@ -56,7 +56,7 @@ class QuizResult:
         return "\n".join(lines).strip()
 
 
-@dataclass
+@dataclass(slots=True)
 class Request:
     """Represents a quiz analysis request with its status and result.
     
@@ -9,6 +9,7 @@ import queue
 
 from typing import Optional, Tuple
 from pynput.mouse import Controller as MouseController
+from screeninfo import get_monitors
 
 
 class PopupManager:
@@ -101,7 +102,6 @@ class PopupManager:
         
         # Get screen size - use screeninfo or default values
         try:
-            from screeninfo import get_monitors
             monitor = get_monitors()[0]
             screen_width = monitor.width
             screen_height = monitor.height
@@ -287,18 +287,23 @@ class PopupManager:
         text_widget.config(state=tk.NORMAL)
         text_widget.delete(1.0, tk.END)
         
-        lines = content.split('\n')
-        for line in lines:
+        # Build alternating text/tag arguments so all lines go in with
+        # a single insert call (one Tcl round-trip, one remeasure)
+        insert_args = []
+        for line in content.split('\n'):
             if line.startswith('Câu ') and ':' in line:
                 # Question line - bold
-                text_widget.insert(tk.END, line + '\n', "question")
+                tag = "question"
             elif line.startswith('→ Đáp án:'):
                 # Answer line - bold and blue
-                text_widget.insert(tk.END, line + '\n', "answer")
+                tag = "answer"
             else:
                 # Normal line
-                text_widget.insert(tk.END, line + '\n', "normal")
-        
+                tag = "normal"
+            insert_args.extend((line + '\n', (tag,)))
+
+        text_widget.insert(tk.END, *insert_args)
+
         text_widget.config(state=tk.DISABLED)
     
     def _update_popup_content(self, content: str):
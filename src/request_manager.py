@@ -5,8 +5,8 @@ This module manages the state of quiz analysis requests, providing thread-safe
 operations for creating, updating, and querying request status.
 """
 
+import itertools
 import threading
-import uuid
 import time
 from typing import Optional, Dict
 from models import Request, QuizResult
@@ -21,13 +21,16 @@ class RequestManager:
     
     Attributes:
         current_request: The currently active Request object, or None
-        lock: Threading lock for thread-safe operations
+        lock: Threading lock for multi-field updates (status + result/error)
     """
     
     def __init__(self):
         """Initialize the RequestManager with no active request."""
         self.current_request: Optional[Request] = None
         self.lock = threading.Lock()
+        # Only one request is tracked at a time, so a process-local counter
+        # is enough for unique IDs (next() on itertools.count is atomic under the GIL)
+        self._id_counter = itertools.count(1)
     
     def create_request(self) -> str:
         """Create a new request and set it as the current request.
@@ -35,19 +38,22 @@ class RequestManager:
         This method is thread-safe and will replace any existing request.
         The new request starts with status "PROCESSING".
         
+        The Request is built outside the lock and published with a single
+        reference assignment, which is atomic under the GIL. Locked methods
+        read current_request once, so they only ever touch one request.
+        
         Returns:
             The unique ID of the newly created request
         """
-        with self.lock:
-            request_id = str(uuid.uuid4())
-            self.current_request = Request(
-                id=request_id,
-                status="PROCESSING",
-                created_at=time.time(),
-                result=None,
-                error=None
-            )
-            return request_id
+        request_id = str(next(self._id_counter))
+        self.current_request = Request(
+            id=request_id,
+            status="PROCESSING",
+            created_at=time.time(),
+            result=None,
+            error=None
+        )
+        return request_id
     
     def update_status(self, status: str) -> None:
         """Update the status of the current request.
@@ -59,8 +65,10 @@ class RequestManager:
             This method is thread-safe. If no current request exists, this is a no-op.
         """
         with self.lock:
-            if self.current_request:
-                self.current_request.status = status
+            # Read the reference once: create/clear publish without the lock
+            request = self.current_request
+            if request:
+                request.status = status
     
     def set_result(self, result: QuizResult) -> None:
         """Set the result for the current request and mark it as completed.
@@ -73,9 +81,10 @@ class RequestManager:
             If no current request exists, this is a no-op.
         """
         with self.lock:
-            if self.current_request:
-                self.current_request.result = result
-                self.current_request.status = "COMPLETED"
+            request = self.current_request
+            if request:
+                request.result = result
+                request.status = "COMPLETED"
     
     def set_error(self, error_message: str) -> None:
         """Set an error message for the current request and mark it as failed.
@@ -88,9 +97,10 @@ class RequestManager:
             If no current request exists, this is a no-op.
         """
         with self.lock:
-            if self.current_request:
-                self.current_request.error = error_message
-                self.current_request.status = "ERROR"
+            request = self.current_request
+            if request:
+                request.error = error_message
+                request.status = "ERROR"
     
     def get_current_status(self) -> Dict:
         """Get the current status and information about the active request.
@@ -106,7 +116,8 @@ class RequestManager:
             This method is thread-safe and returns a snapshot of the current state.
         """
         with self.lock:
-            if not self.current_request:
+            request = self.current_request
+            if not request:
                 return {
                     "status": "NONE",
                     "result": None,
@@ -115,22 +126,22 @@ class RequestManager:
                 }
             
             status_info = {
-                "status": self.current_request.status,
-                "result": self.current_request.result,
-                "error": self.current_request.error,
+                "status": request.status,
+                "result": request.result,
+                "error": request.error,
                 "elapsed_time": None
             }
             
             # Include elapsed time if request is still processing
-            if self.current_request.status == "PROCESSING":
-                status_info["elapsed_time"] = self.current_request.get_elapsed_time()
+            if request.status == "PROCESSING":
+                status_info["elapsed_time"] = request.get_elapsed_time()
             
             return status_info
     
     def clear_request(self) -> None:
         """Clear the current request.
         
-        This method is thread-safe and can be used to reset the request state.
+        This method is thread-safe (single atomic reference store) and can be
+        used to reset the request state.
         """
-        with self.lock:
-            self.current_request = None
+        self.current_request = None
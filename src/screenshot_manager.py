@@ -4,22 +4,85 @@ Manages screen capture and image processing
 """
 
 import io
-from typing import Optional, Tuple
+import sys
+import ctypes
+import threading
+from typing import Optional, Tuple, Union
 from PIL import Image, ImageGrab
 import screeninfo
 
+try:
+    import mss
+except ImportError:
+    # Fallback to PIL ImageGrab when mss is not installed
+    mss = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGRA
+except ImportError:
+    # Optional: capture_and_save_fused falls back to the PIL encode path
+    TurboJPEG = None
+
 
 class ScreenshotManager:
     """Manages screen capture and image processing"""
     
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, png_compress_level: int = 1, jpeg_quality: int = 85,
+                 backend=None):
         """
         Initialize ScreenshotManager
         
         Args:
             logger: Logger instance (optional)
+            png_compress_level: zlib level for PNG encoding, 0-9 (default: 1,
+                fastest lossless encode; higher trades CPU for smaller bytes)
+            jpeg_quality: JPEG quality, 1-95 (default: 85)
+            backend: Object with an mss-style grab(region) returning a shot with
+                .size and .raw BGRA bytes (optional; e.g. a fake for headless tests).
+                Used instead of mss and never closed by this manager
         """
         self.logger = logger
+        self.png_compress_level = png_compress_level
+        self.jpeg_quality = jpeg_quality
+        
+        # Primary monitor info, queried once and re-queried when the display
+        # layout fingerprint changes (see invalidate_monitor_cache)
+        self._monitor_cache: Optional[dict] = None
+        self._monitor_signature: Optional[tuple] = None
+        
+        # One mss instance per capturing thread, created on first capture and
+        # reused afterwards (avoids re-opening display handles per frame).
+        # mss keeps its Windows GDI handles in thread-local storage, so an
+        # instance only works on the thread that created it
+        self._sct_local = threading.local()
+        self._sct_instances = []
+        self._sct_lock = threading.Lock()
+        self._backend = backend
+        
+        # TurboJPEG encoder loaded on first fused capture (False: unavailable)
+        self._turbojpeg = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self) -> None:
+        """
+        Release the screen capture handles of all capturing threads
+        """
+        with self._sct_lock:
+            instances = self._sct_instances
+            self._sct_instances = []
+            self._sct_local = threading.local()
+        
+        for sct in instances:
+            try:
+                sct.close()
+            except Exception:
+                # Handles owned by another thread are freed at process exit
+                pass
     
     def capture_screen(self) -> Optional[Image.Image]:
         """
@@ -36,8 +99,19 @@ class ScreenshotManager:
                 self.logger.info(f"Capturing screen from primary monitor: {monitor_info['width']}x{monitor_info['height']}")
             
             # Capture entire screen
-            # ImageGrab.grab() will capture primary screen by default
-            screenshot = ImageGrab.grab()
+            screenshot = None
+            if self._can_grab():
+                try:
+                    shot = self._grab(monitor_info)
+                    # shot.raw is the capture buffer itself (shot.bgra is a bytes copy)
+                    screenshot = Image.frombytes('RGB', shot.size, shot.raw, 'raw', 'BGRX')
+                except Exception as e:
+                    if self.logger:
+                        self.logger.warning(f"mss capture failed, falling back to ImageGrab: {str(e)}")
+            
+            if screenshot is None:
+                # ImageGrab.grab() will capture primary screen by default
+                screenshot = ImageGrab.grab()
             
             if self.logger:
                 self.logger.info("Screenshot captured successfully")
@@ -54,23 +128,234 @@ class ScreenshotManager:
                 self.logger.error(f"Failed to capture screen: {str(e)}", exc_info=True)
             return None
     
-    def save_to_memory(self, image: Image.Image) -> Optional[bytes]:
+    def capture_to_numpy(self):
         """
-        Convert Image to bytes (PNG format) for API sending
-        Don't save file to disk for speed improvement
+        Capture primary screen straight into a NumPy array (no PIL Image)
+        For pixel consumers (hashing, diffing, OpenCV); requires mss and numpy
+        
+        Returns:
+            uint8 array of shape (height, width, 3) in RGB order, or None if failed.
+            The array is a read-only, non-contiguous view over the captured BGRA
+            buffer (no frame copy); use np.ascontiguousarray() before passing it
+            to OpenCV or other code that needs contiguous or writable memory
+        """
+        try:
+            import numpy as np
+            
+            if not self._can_grab():
+                raise RuntimeError("mss is required for capture_to_numpy")
+            
+            shot = self._grab(self.get_primary_monitor())
+            width, height = shot.size
+            bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(height, width, 4)
+            
+            # Reverse B, G, R channels and drop alpha as a strided view
+            rgb = bgra[:, :, 2::-1]
+            rgb.flags.writeable = False
+            return rgb
+            
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Failed to capture screen to array: {str(e)}", exc_info=True)
+            return None
+    
+    def capture_and_save_fused(self, quality: Optional[int] = None) -> Optional[bytes]:
+        """
+        Capture primary screen and encode JPEG in one step, without a PIL Image
+        The raw BGRA frame from mss goes straight to libjpeg-turbo; falls
+        back to the PIL path when PyTurboJPEG (which brings numpy) or mss
+        is not available, or when the fused capture fails. Both paths encode at full resolution (no max_dim downscale)
         
         Args:
-            image: PIL Image object
+            quality: JPEG quality, 1-95 (default: self.jpeg_quality)
+        
+        Returns:
+            JPEG bytes if successful, None if failed
+        """
+        if quality is None:
+            quality = self.jpeg_quality
+        
+        encoder = self._get_turbojpeg() if self._can_grab() else None
+        if encoder is None:
+            return self.capture_and_save(fmt='JPEG', max_dim=None, quality=quality)
+        
+        try:
+            import numpy as np
+            
+            shot = self._grab(self.get_primary_monitor())
+            width, height = shot.size
+            bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(height, width, 4)
+            
+            image_bytes = encoder.encode(bgra, quality=quality, pixel_format=TJPF_BGRA)
+            
+            if self.logger:
+                self.logger.info(f"Image saved to memory: {len(image_bytes)} bytes")
+            
+            return image_bytes
+            
+        except Exception as e:
+            # Same fallback as without TurboJPEG (capture_screen -> ImageGrab)
+            if self.logger:
+                self.logger.warning(f"Fused capture failed, falling back to PIL path: {str(e)}")
+            return self.capture_and_save(fmt='JPEG', max_dim=None, quality=quality)
+    
+    def _get_turbojpeg(self):
+        """
+        Load the TurboJPEG encoder once
+        
+        Returns:
+            TurboJPEG instance, or None if PyTurboJPEG or libjpeg-turbo is missing
+        """
+        if self._turbojpeg is None and TurboJPEG is not None:
+            try:
+                self._turbojpeg = TurboJPEG()
+            except Exception as e:
+                # PyTurboJPEG installed but the native library was not found
+                if self.logger:
+                    self.logger.warning(f"TurboJPEG unavailable, using PIL encoder: {str(e)}")
+                self._turbojpeg = False
+        return self._turbojpeg or None
+    
+    def _can_grab(self) -> bool:
+        """
+        Check whether raw BGRA capture is available (injected backend or mss)
+        """
+        return self._backend is not None or mss is not None
+    
+    def _grab(self, monitor_info: dict):
+        """
+        Grab primary monitor with the injected backend or this thread's mss instance
+        
+        Args:
+            monitor_info: Result of get_primary_monitor()
+            
+        Returns:
+            mss ScreenShot object (raw BGRA pixels)
+        """
+        sct = self._backend if self._backend is not None else self._get_sct()
+        try:
+            return sct.grab(self._get_capture_region(sct, monitor_info))
+        except Exception as e:
+            # Cached geometry may be stale after a display change: re-query once
+            if self.logger:
+                self.logger.warning(f"Capture failed, refreshing monitor info: {str(e)}")
+            self.invalidate_monitor_cache()
+            if self._backend is None:
+                # mss also caches its monitor list per instance
+                sct = self._reset_sct(sct)
+            return sct.grab(self._get_capture_region(sct, self.get_primary_monitor()))
+    
+    def _get_sct(self):
+        """
+        Get the mss instance of the calling thread, creating it on first use
+        
+        Returns:
+            mss instance owned by the current thread
+        """
+        sct = getattr(self._sct_local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._sct_local.sct = sct
+            with self._sct_lock:
+                self._sct_instances.append(sct)
+        return sct
+    
+    def _reset_sct(self, sct):
+        """
+        Replace the calling thread's mss instance with a fresh one
+        
+        Args:
+            sct: Current mss instance of this thread
             
+        Returns:
+            New mss instance owned by the current thread
+        """
+        with self._sct_lock:
+            if sct in self._sct_instances:
+                self._sct_instances.remove(sct)
+        try:
+            sct.close()
+        except Exception:
+            pass
+        self._sct_local.sct = None
+        return self._get_sct()
+    
+    def _get_capture_region(self, sct, monitor_info: dict) -> dict:
+        """
+        Build mss capture region for the primary monitor
+        Uses detected monitor geometry, or mss's first monitor if detection failed
+        
+        Args:
+            sct: Capture backend (mss instance or injected backend)
+            monitor_info: Result of get_primary_monitor()
+            
+        Returns:
+            mss region dict: left, top, width, height
+        """
+        if self._monitor_cache is None and hasattr(sct, 'monitors'):
+            return sct.monitors[1]
+        
+        return {
+            'left': monitor_info['x'],
+            'top': monitor_info['y'],
+            'width': monitor_info['width'],
+            'height': monitor_info['height']
+        }
+    
+    def save_to_memory(self, image_data: Union[Image.Image, bytes],
+                       size: Optional[Tuple[int, int]] = None,
+                       mode: str = 'BGRX',
+                       fmt: str = 'JPEG',
+                       quality: Optional[int] = None) -> Optional[bytes]:
+        """
+        Convert Image to bytes (JPEG or PNG format) for API sending
+        Don't save file to disk for speed improvement
+
+        Args:
+            image_data: PIL Image object, or raw pixel buffer (e.g. BGRA from mss,
+                unpacked to RGB with one copy)
+            size: (width, height) of the raw buffer, required when image_data is bytes
+            mode: Pillow raw decoder mode of the buffer (default: 'BGRX')
+            fmt: 'JPEG' (default, smaller and faster to encode), 'PNG' (lossless)
+                or 'RAW' (unencoded pixel bytes in the image's mode)
+            quality: JPEG quality, 1-95 (default: self.jpeg_quality)
+
         Returns:
             Image bytes if successful, None if failed
         """
         try:
+            if isinstance(image_data, Image.Image):
+                image = image_data
+            else:
+                if size is None:
+                    raise ValueError("size is required for raw image buffers")
+                # Decode the buffer straight into an RGB image: the BGRX -> RGB
+                # unpack is still one copy (Pillow only maps memory for modes
+                # like RGBX/RGBA), but no intermediate Image is created
+                image = Image.frombuffer('RGB', size, image_data, 'raw', mode, 0, 1)
+
+            if fmt == 'RAW':
+                image_bytes = self._fast_tobytes(image)
+                if self.logger:
+                    self.logger.info(f"Image saved to memory: {len(image_bytes)} bytes")
+                return image_bytes
+            
             # Create BytesIO buffer to save image to memory
             buffer = io.BytesIO()
             
-            # Save image as PNG to buffer
-            image.save(buffer, format='PNG')
+            if fmt == 'JPEG':
+                # JPEG cannot store alpha
+                if image.mode != 'RGB':
+                    image = image.convert('RGB')
+                if quality is None:
+                    quality = self.jpeg_quality
+                image.save(buffer, format='JPEG', quality=quality,
+                           optimize=False, progressive=False, subsampling=2)
+            elif fmt == 'PNG':
+                # Low compress level: fast encode
+                image.save(buffer, format='PNG', compress_level=self.png_compress_level)
+            else:
+                raise ValueError(f"Unsupported image format: {fmt}")
             
             # Get bytes from buffer
             image_bytes = buffer.getvalue()
@@ -88,13 +373,55 @@ class ScreenshotManager:
                 self.logger.error(f"Failed to save image to memory: {str(e)}", exc_info=True)
             return None
     
+    @staticmethod
+    def _fast_tobytes(image: Image.Image) -> bytes:
+        """
+        Get raw pixel bytes in a single encoder call
+        
+        Image.tobytes() encodes in small blocks and joins a list of chunks,
+        which doubles peak memory for a full screenshot. Sizing the encoder
+        buffer to the whole image produces the bytes in one piece.
+        
+        Args:
+            image: PIL Image object
+            
+        Returns:
+            Raw pixel bytes, identical to image.tobytes()
+        """
+        image.load()
+        if image.width == 0 or image.height == 0:
+            return b""
+        
+        try:
+            encoder = Image._getencoder(image.mode, 'raw', image.mode)
+            encoder.setimage(image.im, (0, 0) + image.size)
+            bufsize = image.width * image.height * len(image.getbands())
+            _, errcode, data = encoder.encode(bufsize)
+            if errcode > 0:
+                return data
+        except Exception:
+            pass
+        
+        # Fallback: modes with packed/padded layouts, or Pillow API changes
+        return image.tobytes()
+    
     def get_primary_monitor(self) -> dict:
         """
         Get primary monitor information
+        Result is cached after the first successful query and re-queried when
+        the display layout changes (resolution change, monitor dock/undock)
         
         Returns:
             Dictionary containing monitor info: width, height, x, y, is_primary
         """
+        signature = self._display_signature()
+        if self._monitor_cache is not None:
+            if signature == self._monitor_signature:
+                return self._monitor_cache
+            if self.logger:
+                self.logger.info("Display configuration changed, refreshing monitor info")
+            self._monitor_cache = None
+        
         try:
             # Get list of all monitors
             monitors = screeninfo.get_monitors()
@@ -123,6 +450,8 @@ class ScreenshotManager:
                 if self.logger:
                     self.logger.info(f"Primary monitor detected: {monitor_info}")
                 
+                self._monitor_cache = monitor_info
+                self._monitor_signature = signature
                 return monitor_info
             else:
                 # Fallback: use default information
@@ -152,11 +481,46 @@ class ScreenshotManager:
                 'name': 'Unknown'
             }
     
-    def capture_and_save(self) -> Optional[bytes]:
+    def invalidate_monitor_cache(self) -> None:
+        """
+        Drop cached monitor info so the next get_primary_monitor() re-queries
+        Called automatically when a capture fails or the display layout changes
+        """
+        self._monitor_cache = None
+        self._monitor_signature = None
+    
+    @staticmethod
+    def _display_signature() -> Optional[tuple]:
+        """
+        Cheap fingerprint of the display layout (Windows only)
+        A few GetSystemMetrics calls, no monitor enumeration; changes on
+        resolution change or monitor dock/undock
+        
+        Returns:
+            Tuple of screen metrics, or None where unsupported
+        """
+        if sys.platform != 'win32':
+            return None
+        try:
+            get_metric = ctypes.windll.user32.GetSystemMetrics
+            # SM_CXSCREEN, SM_CYSCREEN, SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN,
+            # SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN, SM_CMONITORS
+            return tuple(get_metric(index) for index in (0, 1, 76, 77, 78, 79, 80))
+        except Exception:
+            return None
+    
+    def capture_and_save(self, fmt: str = 'JPEG', max_dim: Optional[int] = 1280,
+                         quality: Optional[int] = None) -> Optional[bytes]:
         """
         Capture screen and convert to bytes in one step
         Convenience method to simplify workflow
         
+        Args:
+            fmt: Output format, 'JPEG' (default) or 'PNG'
+            max_dim: Downscale so the longest edge is at most this many pixels
+                before encoding (encode cost scales with pixel count); None keeps full size
+            quality: JPEG quality, 1-95 (default: self.jpeg_quality)
+        
         Returns:
             Image bytes if successful, None if failed
         """
@@ -167,8 +531,12 @@ class ScreenshotManager:
             if screenshot is None:
                 return None
             
+            # Downscale in place (thumbnail keeps aspect ratio, no extra full-size copy)
+            if max_dim and max(screenshot.size) > max_dim:
+                screenshot.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS)
+            
             # Convert to bytes
-            image_bytes = self.save_to_memory(screenshot)
+            image_bytes = self.save_to_memory(screenshot, fmt=fmt, quality=quality)
             
             return image_bytes
             
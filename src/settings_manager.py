@@ -5,15 +5,33 @@ Manages application settings with GUI
 
 import os
 import json
-import hashlib
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-from typing import Optional, Dict, Any
+import atexit
+import base64
+import queue
+import logging
+import threading
+from typing import Optional, Dict, Any, TYPE_CHECKING
+
+# tkinter and google.genai are imported lazily inside the dialog/test
+# functions so that code which only reads settings stays lightweight
+if TYPE_CHECKING:
+    import tkinter as tk
+
+logger = logging.getLogger(__name__)
+
+# Gemini clients reused across API key tests, keyed by API key
+_client_cache: Dict[str, Any] = {}
+
+# Settings dialog kept alive between opens (see show_settings_dialog)
+_settings_dialog_singleton: Optional[Dict[str, Any]] = None
 
 
 class SettingsManager:
     """Manages application settings"""
     
+    # Delay before pending changes from set() are written to disk
+    FLUSH_DELAY = 2.0
+    
     DEFAULT_SETTINGS = {
         'font_size': 9,
         'popup_width': 400,
@@ -31,38 +49,51 @@ class SettingsManager:
     def __init__(self, config_file: str = "config.json"):
         self.config_file = config_file
         self.settings = self.DEFAULT_SETTINGS.copy()
+        # Snapshot of what is on disk, used to skip no-op saves
+        self._last_saved: Optional[Dict[str, Any]] = None
         self.load_settings()
+        
+        # Batched writes: set() marks settings dirty, a timer flushes once
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+        atexit.register(self._flush)
     
     def load_settings(self) -> None:
         """Load settings from config file"""
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    # Load all settings from config, use defaults for missing keys
-                    for key in self.DEFAULT_SETTINGS:
-                        if key in config:
-                            self.settings[key] = config[key]
-                    # Also load non-default settings (like gemini_api_key)
-                    for key in config:
-                        if key not in self.settings:
-                            self.settings[key] = config[key]
-            except Exception:
-                pass
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+                # Load all settings from config, use defaults for missing keys
+                for key in self.DEFAULT_SETTINGS:
+                    if key in config:
+                        self.settings[key] = config[key]
+                # Also load non-default settings (like gemini_api_key)
+                for key in config:
+                    if key not in self.settings:
+                        self.settings[key] = config[key]
+            self._last_saved = config
+        except Exception:
+            # Missing or unreadable file - keep defaults
+            pass
     
     def save_settings(self) -> None:
         """Save settings to config file"""
+        # Explicit save covers any pending deferred flush
+        self._dirty = False
+        if self.settings == self._last_saved:
+            return
         try:
-            config = {}
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-            
-            # Update all settings
-            config.update(self.settings)
-            
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            # self.settings already holds every key loaded from the file,
+            # so write it out directly without re-reading config.json
+            tmp_file = self.config_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            # Atomic on both POSIX and Windows - no torn config on crash
+            os.replace(tmp_file, self.config_file)
+            self._last_saved = dict(self.settings)
         except Exception as e:
             print(f"Error saving settings: {e}")
     
@@ -71,17 +102,47 @@ class SettingsManager:
         return self.settings.get(key, default)
     
     def set(self, key: str, value: Any) -> None:
-        """Set setting value"""
+        """Set setting value (written to disk by a deferred flush)"""
         self.settings[key] = value
+        self._schedule_flush()
+    
+    def _schedule_flush(self) -> None:
+        """Mark settings dirty and start flush timer if none is pending"""
+        with self._flush_lock:
+            self._dirty = True
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FLUSH_DELAY, self._flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _flush(self) -> None:
+        """Write pending changes to disk once"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
         self.save_settings()
 
 
-def show_api_key_dialog(parent: Optional[tk.Tk] = None) -> Optional[str]:
+def show_api_key_dialog(parent: Optional['tk.Misc'] = None) -> Optional[str]:
     """
     Show dialog to enter API key
     Returns API key if entered, None if cancelled
+    
+    If parent is given, the dialog is a modal Toplevel of parent and
+    waits on the parent's event loop instead of starting its own.
     """
-    root = tk.Tk()
+    import tkinter as tk
+    from tkinter import messagebox
+    
+    if parent is not None:
+        root = tk.Toplevel(parent)
+        root.transient(parent)
+    else:
+        root = tk.Tk()
     root.title("AI Quiz Assistant - Setup Required")
     root.geometry("450x220")
     root.resizable(False, False)
@@ -151,7 +212,11 @@ def show_api_key_dialog(parent: Optional[tk.Tk] = None) -> Optional[str]:
     # Handle window close
     root.protocol("WM_DELETE_WINDOW", on_cancel)
     
-    root.mainloop()
+    if parent is not None:
+        root.grab_set()
+        root.wait_window()
+    else:
+        root.mainloop()
     
     return result['api_key']
 
@@ -167,7 +232,9 @@ def test_api_key(api_key: str) -> tuple[bool, str]:
         from google import genai
         from google.genai import types
         
-        client = genai.Client(api_key=api_key)
+        client = _client_cache.get(api_key)
+        if client is None:
+            client = _client_cache.setdefault(api_key, genai.Client(api_key=api_key))
         
         # Simple test request
         response = client.models.generate_content(
@@ -199,11 +266,51 @@ def show_settings_dialog(settings_manager: SettingsManager,
                          on_api_change: callable = None,
                          on_settings_change: callable = None,
                          on_mode_change: callable = None,
-                         on_hotkey_change: callable = None) -> None:
+                         on_hotkey_change: callable = None,
+                         parent: Optional['tk.Misc'] = None) -> None:
     """
     Show settings dialog with all configuration options
+    
+    If parent is given, the dialog is a modal Toplevel of parent and
+    waits on the parent's event loop instead of starting its own.
+    
+    The dialog is built once and hidden on close; later calls refresh
+    the widget values and show the same window again. It is rebuilt if a
+    later call passes a different settings_manager or parent.
     """
-    dialog = tk.Tk()
+    global _settings_dialog_singleton
+    
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+    
+    callbacks = {
+        'on_api_change': on_api_change,
+        'on_settings_change': on_settings_change,
+        'on_mode_change': on_mode_change,
+        'on_hotkey_change': on_hotkey_change,
+    }
+    
+    # Reuse the dialog built by a previous call if it is still alive
+    if _settings_dialog_singleton is not None:
+        singleton = _settings_dialog_singleton
+        try:
+            if singleton['dialog'].winfo_exists():
+                if (singleton['settings_manager'] is settings_manager
+                        and singleton['parent'] is parent):
+                    singleton['callbacks'].update(callbacks)
+                    singleton['open']()
+                    return
+                # Built for another settings manager or parent: rebuild
+                singleton['dialog'].destroy()
+        except tk.TclError:
+            pass
+        _settings_dialog_singleton = None
+    
+    if parent is not None:
+        dialog = tk.Toplevel(parent)
+        dialog.transient(parent)
+    else:
+        dialog = tk.Tk()
     dialog.title("AI Quiz Assistant - Settings")
     dialog.geometry("450x450")
     dialog.resizable(False, False)
@@ -214,11 +321,14 @@ def show_settings_dialog(settings_manager: SettingsManager,
     y = (dialog.winfo_screenheight() - 450) // 2
     dialog.geometry(f"+{x}+{y}")
     
-    # Bring to front - CRITICAL for visibility
-    dialog.lift()
-    dialog.attributes('-topmost', True)
-    dialog.after(100, lambda: dialog.attributes('-topmost', False))
-    dialog.focus_force()
+    def bring_to_front():
+        # Bring to front - CRITICAL for visibility
+        dialog.lift()
+        dialog.attributes('-topmost', True)
+        dialog.after(100, lambda: dialog.attributes('-topmost', False))
+        dialog.focus_force()
+    
+    bring_to_front()
     
     # Title
     tk.Label(dialog, text="Settings", 
@@ -253,24 +363,60 @@ def show_settings_dialog(settings_manager: SettingsManager,
         api_entry.focus()
         api_status_label.config(text="", fg="black")
     
+    def show_test_result(success, message):
+        if success:
+            api_status_label.config(text=f"✅ {message}", fg="green")
+        else:
+            api_status_label.config(text=f"❌ {message}", fg="red")
+    
+    # Bumped per test and on refresh(); results from older tests are dropped
+    test_generation = 0
+    
     def do_test_api():
+        nonlocal test_generation
+        test_generation += 1
+        generation = test_generation
+        
         api_status_label.config(text="Testing...", fg="blue")
-        dialog.update()
+        dialog.update_idletasks()
         
         # Get API key to test
         api_key = api_entry.get().strip()
         if api_key.startswith("*"):
-            api_key = current_api_key
+            api_key = os.getenv('GEMINI_API_KEY', '')
         
         if not api_key:
             api_status_label.config(text="❌ No API key to test", fg="red")
             return
         
-        success, message = test_api_key(api_key)
-        if success:
-            api_status_label.config(text=f"✅ {message}", fg="green")
-        else:
-            api_status_label.config(text=f"❌ {message}", fg="red")
+        # Run network call off the Tk thread and poll for the result from
+        # the Tk thread (Tk calls from other threads fail under wait_variable)
+        results = queue.Queue()
+        
+        def worker():
+            results.put(test_api_key(api_key))
+        
+        def poll_result():
+            if generation != test_generation:
+                # Superseded by a newer test or the dialog was reopened
+                return
+            try:
+                success, message = results.get_nowait()
+            except queue.Empty:
+                try:
+                    dialog.after(100, poll_result)
+                except tk.TclError:
+                    # Dialog destroyed before the test finished
+                    pass
+                return
+            
+            try:
+                show_test_result(success, message)
+            except tk.TclError:
+                pass
+        
+        threading.Thread(target=worker, daemon=True).start()
+        dialog.after(100, poll_result)
     
     btn_row = tk.Frame(api_frame)
     btn_row.pack(anchor=tk.W, pady=(5, 0))
@@ -286,14 +432,13 @@ def show_settings_dialog(settings_manager: SettingsManager,
     
     # Get current mode value
     current_mode = settings_manager.get('question_mode')
-    print(f"DEBUG Question Mode - current_mode: {repr(current_mode)}")
+    logger.debug("Question mode setting: %r", current_mode)
     
     if not current_mode:
         current_mode = 'multiple_choice'
     
     mode_var = tk.StringVar(master=dialog)
     mode_var.set(current_mode)
-    print(f"DEBUG After set - mode_var: {repr(mode_var.get())}")
     
     # Multiple Choice option
     mc_frame = ttk.LabelFrame(mode_frame, text="Multiple Choice (A, B, C, D)", padding=10)
@@ -317,12 +462,13 @@ def show_settings_dialog(settings_manager: SettingsManager,
     display_frame = ttk.Frame(notebook, padding=10)
     notebook.add(display_frame, text="Display")
     
-    # Get current values with debug
+    # Get current values
     current_font_size = settings_manager.get('font_size')
     current_popup_width = settings_manager.get('popup_width')
     current_apl = settings_manager.get('answers_per_line')
     
-    print(f"DEBUG Display - font_size: {current_font_size}, popup_width: {current_popup_width}, apl: {current_apl}")
+    logger.debug("Display settings - font_size: %s, popup_width: %s, apl: %s",
+                 current_font_size, current_popup_width, current_apl)
     
     if not current_font_size or current_font_size == 0:
         current_font_size = 9
@@ -331,31 +477,30 @@ def show_settings_dialog(settings_manager: SettingsManager,
     if not current_apl or current_apl == 0:
         current_apl = 10
     
+    # Single grid layout: label row followed by scale row for each setting
     # Font size
-    tk.Label(display_frame, text="Font Size:", font=("Segoe UI", 9)).pack(anchor=tk.W)
+    tk.Label(display_frame, text="Font Size:", font=("Segoe UI", 9)).grid(row=0, column=0, sticky='w')
     font_var = tk.IntVar(master=dialog)
     font_var.set(int(current_font_size))
     font_scale = tk.Scale(display_frame, from_=6, to=14, orient=tk.HORIZONTAL, 
                           variable=font_var, length=200)
-    font_scale.pack(anchor=tk.W, pady=(0, 10))
+    font_scale.grid(row=1, column=0, sticky='w', pady=(0, 10))
     
     # Popup width
-    tk.Label(display_frame, text="Popup Width:", font=("Segoe UI", 9)).pack(anchor=tk.W)
+    tk.Label(display_frame, text="Popup Width:", font=("Segoe UI", 9)).grid(row=2, column=0, sticky='w')
     width_var = tk.IntVar(master=dialog)
     width_var.set(int(current_popup_width))
     width_scale = tk.Scale(display_frame, from_=250, to=600, orient=tk.HORIZONTAL,
                            variable=width_var, length=200)
-    width_scale.pack(anchor=tk.W, pady=(0, 10))
+    width_scale.grid(row=3, column=0, sticky='w', pady=(0, 10))
     
     # Answers per line
-    tk.Label(display_frame, text="Answers per line:", font=("Segoe UI", 9)).pack(anchor=tk.W)
+    tk.Label(display_frame, text="Answers per line:", font=("Segoe UI", 9)).grid(row=4, column=0, sticky='w')
     apl_var = tk.IntVar(master=dialog)
     apl_var.set(int(current_apl))
     apl_scale = tk.Scale(display_frame, from_=5, to=20, orient=tk.HORIZONTAL,
                          variable=apl_var, length=200)
-    apl_scale.pack(anchor=tk.W)
-    
-    print(f"DEBUG After set - font_var: {font_var.get()}, width_var: {width_var.get()}, apl_var: {apl_var.get()}")
+    apl_scale.grid(row=5, column=0, sticky='w')
     
     # === Hotkeys Tab (Editable) ===
     hotkey_frame = ttk.Frame(notebook, padding=10)
@@ -365,13 +510,8 @@ def show_settings_dialog(settings_manager: SettingsManager,
              font=("Segoe UI", 9, "bold")).pack(anchor=tk.W, pady=(0, 10))
     
     # Hotkey defaults
-    hotkey_defaults = {
-        'hotkey_capture': 'z',
-        'hotkey_results': 'x',
-        'hotkey_answers': 'c',
-        'hotkey_reset': 'r',
-        'hotkey_settings': 's',
-    }
+    hotkey_defaults = {key: value for key, value in SettingsManager.DEFAULT_SETTINGS.items()
+                       if key.startswith('hotkey_')}
     
     # Store entries for later access
     hotkey_entries = {}
@@ -384,21 +524,24 @@ def show_settings_dialog(settings_manager: SettingsManager,
         ('hotkey_settings', 'Open Settings:'),
     ]
     
-    for key, label in hotkey_labels:
-        row = tk.Frame(hotkey_frame)
-        row.pack(fill=tk.X, pady=2)
-        
-        tk.Label(row, text=label, font=("Segoe UI", 9), width=18, anchor=tk.W).pack(side=tk.LEFT)
-        tk.Label(row, text="Alt +", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(0, 5))
+    # One grid for all hotkey rows instead of a packed Frame per row
+    hotkey_grid = tk.Frame(hotkey_frame)
+    hotkey_grid.pack(fill=tk.X)
+    hotkey_grid.grid_columnconfigure(2, weight=1)
+    
+    for row, (key, label) in enumerate(hotkey_labels):
+        tk.Label(hotkey_grid, text=label, font=("Segoe UI", 9), width=18,
+                 anchor=tk.W).grid(row=row, column=0, sticky='w', pady=2)
+        tk.Label(hotkey_grid, text="Alt +", font=("Segoe UI", 9)).grid(row=row, column=1, sticky='w', padx=(0, 5))
         
         # Get current value from settings, fallback to default
         current_value = settings_manager.get(key)
         if not current_value:
             current_value = hotkey_defaults[key]
         
-        entry = tk.Entry(row, font=("Consolas", 10), width=3, justify=tk.CENTER)
+        entry = tk.Entry(hotkey_grid, font=("Consolas", 10), width=3, justify=tk.CENTER)
         entry.insert(0, current_value.upper())
-        entry.pack(side=tk.LEFT)
+        entry.grid(row=row, column=2, sticky='w')
         
         hotkey_entries[key] = entry
         
@@ -433,14 +576,13 @@ Middle + Scroll Down   Show Answers"""
         # Save API key if changed
         api_key = api_entry.get().strip()
         if api_key and not api_key.startswith("*"):
-            import base64
             # Encode API key (simple obfuscation)
             encoded_key = base64.b64encode(api_key.encode()).decode()
             # Update in settings_manager (will be saved with other settings)
             settings_manager.settings['gemini_api_key'] = encoded_key
             os.environ['GEMINI_API_KEY'] = api_key
-            if on_api_change:
-                on_api_change()
+            if callbacks['on_api_change']:
+                callbacks['on_api_change']()
         
         # Check if mode changed
         old_mode = settings_manager.get('question_mode', 'multiple_choice')
@@ -464,29 +606,80 @@ Middle + Scroll Down   Show Answers"""
         # Save all settings to file at once
         settings_manager.save_settings()
         
-        if on_settings_change:
-            on_settings_change()
+        if callbacks['on_settings_change']:
+            callbacks['on_settings_change']()
         
         # Notify mode change
-        if old_mode != new_mode and on_mode_change:
-            on_mode_change(new_mode)
+        if old_mode != new_mode and callbacks['on_mode_change']:
+            callbacks['on_mode_change'](new_mode)
         
         # Notify hotkey change
-        if hotkeys_changed and on_hotkey_change:
-            on_hotkey_change()
+        if hotkeys_changed and callbacks['on_hotkey_change']:
+            callbacks['on_hotkey_change']()
         
         msg = "Settings saved!"
         if hotkeys_changed:
             msg += "\nHotkey changes will apply after restart."
         messagebox.showinfo("Success", msg, parent=dialog)
-        dialog.destroy()
+        close_dialog()
     
     def on_cancel():
-        dialog.destroy()
+        close_dialog()
     
     tk.Button(btn_frame, text="Save", command=on_save, width=10).pack(side=tk.LEFT, padx=5)
     tk.Button(btn_frame, text="Cancel", command=on_cancel, width=10).pack(side=tk.LEFT, padx=5)
     
     dialog.protocol("WM_DELETE_WINDOW", on_cancel)
     
-    dialog.mainloop()
+    # Set when the dialog is hidden; open_dialog() waits on it
+    closed_var = tk.BooleanVar(master=dialog, value=False)
+    
+    def refresh():
+        nonlocal test_generation
+        # Drop any Test API result still pending from the previous session
+        test_generation += 1
+        
+        # Re-sync widget values with current settings before reopening
+        api_entry.config(state='normal')
+        api_entry.delete(0, tk.END)
+        if os.getenv('GEMINI_API_KEY', ''):
+            api_entry.insert(0, "********** (configured)")
+            api_entry.config(state='disabled')
+        api_status_label.config(text="", fg="black")
+        
+        defaults = SettingsManager.DEFAULT_SETTINGS
+        mode_var.set(settings_manager.get('question_mode') or defaults['question_mode'])
+        font_var.set(int(settings_manager.get('font_size') or defaults['font_size']))
+        width_var.set(int(settings_manager.get('popup_width') or defaults['popup_width']))
+        apl_var.set(int(settings_manager.get('answers_per_line') or defaults['answers_per_line']))
+        
+        for key, entry in hotkey_entries.items():
+            entry.delete(0, tk.END)
+            entry.insert(0, (settings_manager.get(key) or hotkey_defaults[key]).upper())
+    
+    def close_dialog():
+        if parent is not None:
+            dialog.grab_release()
+        dialog.withdraw()
+        closed_var.set(True)
+    
+    def open_dialog(reuse: bool = True):
+        if reuse:
+            refresh()
+            dialog.deiconify()
+            bring_to_front()
+        closed_var.set(False)
+        if parent is not None:
+            dialog.grab_set()
+        # Nested event loop until the dialog is hidden again
+        dialog.wait_variable(closed_var)
+    
+    _settings_dialog_singleton = {
+        'dialog': dialog,
+        'callbacks': callbacks,
+        'open': open_dialog,
+        'settings_manager': settings_manager,
+        'parent': parent,
+    }
+    
+    open_dialog(reuse=False)
@@ -4,13 +4,92 @@ Manages system tray icon and menu
 """
 
 import pystray
-from PIL import Image, ImageDraw, ImageFont
-from threading import Thread
+import base64
+import functools
+import threading
+from io import BytesIO
+from PIL import Image
+
+
+# Pre-rendered 256x256 master tray icon: white "Q" on #0066CC background (PNG, base64)
+_ICON_PNG_B64 = (
+    "iVBORw0KGgoAAAANSUhEUgAAAQAAAAEABAMAAACuXLVVAAAAMFBMVEX////7/f7y9/zn8frX"
+    "5/fE3POw0O+bw+uCtOZtp+Jbnd4/jNgietMVctAGas0AZsyFt1ArAAAHpklEQVR42u2dW2xU"
+    "RRiAZ29toSZuqVgETTaSBgiYFKkmKiRrfPACaDEaiVFThAcxGgjyhAmFKI8Kb5IYBbUxxBBb"
+    "0YgmVOoVLaXdGIwkiruJKRRa3U1U2u7ljA/S+efs5cw/Z2b2RJ3zNHTnzPn2v8+cmSVESbBX"
+    "mFgAC2ABLIAFsAAWwAJYAAtgASyABbAAFsACWAALYAEsgAWwABbAAlgAC2ABLIAFsAD/d4Co"
+    "2u2/50hLS0AAkwMjvwxnCCGLb161qjPhexzq63I+3ewaJbJxwN9A1B/AJxsqv8l9n9UNoPBC"
+    "dXt+NlsfgG87aqlzycl6AHzsZdLvmwfo9TTpyCumAXpFge1VswAfCd068qZJgG8woU3OEkMy"
+    "O6nySzKIXo3nEoaSUekxzPPJzBOmQvHb2DF3m1HB+A3YnrGhDgMqcLaiuxaeM6GCLyUGDR3S"
+    "r4Jie7kFRh5ZtbJlnpPNnj8xkCv7rGlKuwTeKnf3XWn4cGJfvOzjHt2BKO9+QujxtPvziR1l"
+    "wUA3gFsA0Tcqa6R3475EgAQouEaPVY22p1x9mvQCuFygoUa0P+UKwX06AUpJVLZx5apFOgHG"
+    "ePvzyPjv8CFuVCPAdm7gdV7VOt9xvb5AVGjg/Gs87pWw2yAkNU5rywXnOAUc9Ho+aeCUMNOv"
+    "LRJ2Q/flEuZ6iy4bmOEEJqy3znLiwABgVPAdNJclRZ25HvnDmlTQLeVaZ+V0gPCCYow1m/9E"
+    "VI6dKRk/QKiAM4GXESKN7AUdpLSo4LCcVfE2u02HFzhQYD6IC+9gM806ADg9Iuc830Pe1uGG"
+    "ExBbk7gqbynE8EENRjjAWrdjpwWgg34NRtglW2JQ+jm75Ub1OABRIFrAVtrTc/DluVAF8NQG"
+    "dKkfYxkzn1MGOM1aj6IBIswInH5lgJOs1Y2fmm1iLaEbCG3g7kFpEyBkau5s65o/FAHABiWm"
+    "ezJ3iVRQYq35MkvgLGQVVW0ABnhYZt0FAFKKAMOVY2IuiF6qAOz+kBRAu36AWFwGIFLFjRUB"
+    "IsQfwHk1gJJPgCirYhw1ALj9Hrk3QclKP/YnAdbqkANIaAJwKkeUBchokoAkwErWUgMY8auC"
+    "Vk0ArJ6IxolPP1QDyPhZ1nf3z+mRQEgSIKRbBeGAADLqEkgHo4IwQcZiYzbA3JYG4wUkLi2q"
+    "qvM23xIAACUJUOkv5DVGfQH0qIBokMB/BYAEY4QEm1L8R5B/zVYu/xJQAkDnNNQYSgA0IAkk"
+    "fAPokQDamfxXEmFkeS8L4GQ0S8CRBKBBq4BWmaLUFQA9p8PagH8VaAIoSQKUsHkULYFUMCq4"
+    "zm8sPqMJIOwXAMrpDk0AKZ8AorWlMHaWPSoHkMICCBar6bzZrIZ5acrZIHvu3L+UJBBKzraK"
+    "Pr1QUQWwMiMXCPBr3GiAopQVTlYO4BPgVtYalAEY0QYAkahPBqCfmUCHmhdwG2hk3MBpnXUe"
+    "4RYCkQQiLJdIvLMiBVaSCs8viADCXWzQjB8nWKw8MWGBgNvIILyOstYGceUguH5lPW/Cn79I"
+    "QgRXfnk900Sw9lTFcmN5ZRXEWD7Po0PRZbhbfXIKVog3AjCBTqJsAxQiYDPSBIpQBO3XsJHp"
+    "SjOLCT8nUAKAV9fh8wllFXD7FkpIHbwH9yY0qEBuW5BbA2u07KaD3QhTKD8Yh5D5NNEhAW4H"
+    "wHq5jVSRrJbddM5i9pVil+PC7hC5UAkUoYLwdghxPeLuB6G5BbOAgpj2XlgEZn1JJIJ8I5Fw"
+    "QtwyXRuMkxeK4DVoNqLCBsasOP+Ppb27jnNDb8OMjQK4wo16l/eu3i6umEprAyhxlaX38ZEP"
+    "OVTc7nbc3vIP+NDsUWO4tn0f0gjgKiuW1QwvhSTXDXnIA3nAYQ9PsLZWEujmez2lFcC9IeuB"
+    "6t/f9fxoWiuA0+UiuL/K6BOu5yNPF+BP2Yy5o8f1FYdLj7vnYJFRzQBlIiDhra5jxkPlJ4HX"
+    "aT9xeaEiiG98feSfj04f2Vz+IdYCJM6a0R0HKv/Y2dJybfq3KstHT6LPJuLPG3JpTnh5H0SR"
+    "zoZXI+AxdFfBQRT5bHg1znRhx1xr6NTtpaU53QqQe3HZ1ovrd6/E8+V+AMHZi7MWmZ8BkDt5"
+    "7U43Na8eYwC0gDLEJnMASIL95gBoYRMCYI7JX2AovoQg6DMIQOnxGvX+PNmC1C8AndhZ5fHR"
+    "FyehJBAfilMCoHRoZ1mwad81SukX8O8VhgEonTiyhWnitmeOZimltJCQr4hCCv+XDT2TzeZC"
+    "LfFW9nr42ENQEx7TXQ/IrVCS6E8J7clIfMWgair2BCEBfnlEvJRgQAKkEVZT8nuCkAC3SKnz"
+    "3LHE1QTJauZAEBLgF5TmXAlAAmQBTNGn+oOQAPlqDWsuHAtAAuQOSEkXBzUXpbiLi8HLzeaC"
+    "Wu/s5rPpQ2S4o/4qIFFwv9LzARihaxorTkkmtnQ2QBAu7g5CAnxKEi7wG9nU2iixwG9EAuTi"
+    "QnRKMrOtdwGXkvYEIQHywwrIj1MBSID/JYrpw0FIgE9J3luZTG3t5lLS1GAQEiBfr4aUdDYA"
+    "CZA7YTnnx1R90/Hse559LA2srm86Ztfk6NVTVuEtAdiAiXVCC2ABLIAFsAAWwAJYAAtgASyA"
+    "ketvBvxZoLeglZMAAAAASUVORK5CYII="
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _build_master_icon() -> Image.Image:
+    """
+    Decode the master tray icon once per process
+    
+    Returns:
+        Shared 256x256 PIL Image object (do not mutate, copy first)
+    """
+    # Decode the embedded PNG instead of rendering the glyph at runtime
+    return Image.open(BytesIO(base64.b64decode(_ICON_PNG_B64))).convert('RGB')
+
+
+@functools.lru_cache(maxsize=8)
+def _build_icon(size: int) -> Image.Image:
+    """
+    Build the tray icon at the given size once per process
+    
+    Args:
+        size: Icon width and height in pixels
+    
+    Returns:
+        Shared PIL Image object (do not mutate, copy first)
+    """
+    master = _build_master_icon()
+    if master.size == (size, size):
+        return master
+    return master.resize((size, size), Image.Resampling.LANCZOS)
 
 
 class SystemTray:
     """Manages system tray icon and menu"""
     
+    # Seconds to wait for more notifications before showing one
+    NOTIFY_DELAY = 0.25
+    
     def __init__(self, app):
         """
         Initialize SystemTray
@@ -20,53 +99,28 @@ class SystemTray:
         """
         self.app = app
         self.icon = None
-        self._running = False
+        # Set while the tray icon is running
+        self._running = threading.Event()
+        
+        # Latest (title, message) waiting to be shown, and its flush timer
+        self._notify_pending = None
+        self._notify_timer = None
+        self._notify_lock = threading.Lock()
     
-    def create_icon(self) -> Image.Image:
+    def create_icon(self, size: int = 64) -> Image.Image:
         """
         Create simple system tray icon using PIL
-        Draw "Q" letter on background
+        Scaled down from the embedded 256x256 "Q" icon PNG
+        
+        Args:
+            size: Icon width and height in pixels (default: 64; HiDPI
+                shells may ask for 32, 48, 128 or 256)
         
         Returns:
             PIL Image object for icon
         """
-        # Create 64x64 image with blue background
-        width = 64
-        height = 64
-        image = Image.new('RGB', (width, height), color='#0066CC')
-        
-        # Create draw object
-        draw = ImageDraw.Draw(image)
-        
-        # Draw white "Q" letter in center
-        # Use default font since no font file available
-        try:
-            # Try to load font with large size
-            font = ImageFont.truetype("arial.ttf", 48)
-        except:
-            # Fallback to default font
-            font = ImageFont.load_default()
-        
-        # Calculate position to center "Q" letter
-        text = "Q"
-        
-        # Use textbbox to calculate text size
-        try:
-            bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-        except:
-            # Fallback for older PIL versions
-            text_width = 30
-            text_height = 30
-        
-        x = (width - text_width) // 2
-        y = (height - text_height) // 2
-        
-        # Draw "Q" letter
-        draw.text((x, y), text, fill='white', font=font)
-        
-        return image
+        # Copy so callers (pystray) never mutate the shared cached image
+        return _build_icon(size).copy()
     
     def create_menu(self) -> pystray.Menu:
         """
@@ -110,11 +164,33 @@ class SystemTray:
     def show_notification(self, title: str, message: str):
         """
         Show notification from system tray (optional)
+        Bursts within NOTIFY_DELAY seconds are coalesced: only the last
+        notification is shown
         
         Args:
             title: Notification title
             message: Notification content
         """
+        with self._notify_lock:
+            self._notify_pending = (title, message)
+            if self._notify_timer is None:
+                self._notify_timer = threading.Timer(self.NOTIFY_DELAY, self._flush_notify)
+                self._notify_timer.daemon = True
+                self._notify_timer.start()
+    
+    def _flush_notify(self):
+        """
+        Show the latest pending notification (runs on timer thread)
+        """
+        with self._notify_lock:
+            pending = self._notify_pending
+            self._notify_pending = None
+            self._notify_timer = None
+        
+        if pending is None:
+            return
+        
+        title, message = pending
         if self.icon and self.icon.visible:
             try:
                 self.icon.notify(message, title)
@@ -122,45 +198,62 @@ class SystemTray:
                 # Notification not supported on some systems
                 pass
     
+    def _create_tray_icon(self) -> pystray.Icon:
+        """
+        Create pystray.Icon with icon image and menu
+        
+        Returns:
+            pystray.Icon object (not yet running)
+        """
+        return pystray.Icon(
+            "QuizAssistant",
+            self.create_icon(),
+            "AI Quiz Assistant",
+            self.create_menu()
+        )
+    
     def run(self):
         """
-        Run system tray in separate thread
-        Create icon and menu, then run event loop
+        Run system tray event loop in the calling thread
+        Create icon and menu, then run event loop (blocking)
         """
-        if self._running:
+        if self._running.is_set():
             return
         
-        self._running = True
-        
-        # Create icon image
-        icon_image = self.create_icon()
+        self._running.set()
         
-        # Create menu
-        menu = self.create_menu()
-        
-        # Create pystray.Icon
-        self.icon = pystray.Icon(
-            "QuizAssistant",
-            icon_image,
-            "AI Quiz Assistant",
-            menu
-        )
+        self.icon = self._create_tray_icon()
         
         # Run icon (blocking call)
         self.icon.run()
     
     def start(self):
         """
-        Start system tray in separate thread
+        Start system tray without blocking the caller
+        Icon is built synchronously, then its event loop runs in a daemon
+        thread (pystray's run_detached uses a non-daemon thread on Win32,
+        which would keep the process alive on exit paths that skip stop())
         """
-        if not self._running:
-            thread = Thread(target=self.run, daemon=True)
-            thread.start()
+        if self._running.is_set():
+            return
+        
+        self._running.set()
+        
+        self.icon = self._create_tray_icon()
+        threading.Thread(target=self.icon.run, daemon=True).start()
     
     def stop(self):
         """
         Stop system tray
         """
+        self._running.clear()
+        
+        # Drop any notification still waiting to be shown
+        with self._notify_lock:
+            if self._notify_timer is not None:
+                self._notify_timer.cancel()
+            self._notify_timer = None
+            self._notify_pending = None
+        
         if self.icon:
             self.icon.stop()
-        self._running = False